@@ -0,0 +1,31 @@
+"""Drop redundant non-unique indexes on primary key columns
+
+Revision ID: 0a6e5d8c2f19
+Revises: b7c3e9f41a08
+Create Date: 2026-10-15 11:34:58.402183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6e5d8c2f19'
+down_revision: Union[str, None] = 'b7c3e9f41a08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Primary keys are already backed by a unique index
+    op.drop_index(op.f('ix_payment_submissions_id'), table_name='payment_submissions')
+    op.drop_index(op.f('ix_categories_id'), table_name='categories')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_categories_id'), 'categories', ['id'], unique=False)
+    op.create_index(op.f('ix_payment_submissions_id'), 'payment_submissions', ['id'], unique=False)
@@ -0,0 +1,33 @@
+"""Add partial index on active categories by public token
+
+Revision ID: 3f8a6d2b0e57
+Revises: 9e4f2c1a7b36
+Create Date: 2026-10-15 10:48:03.127659
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a6d2b0e57'
+down_revision: Union[str, None] = '9e4f2c1a7b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Public endpoints only look up active categories by token
+    op.create_index(
+        'ix_categories_public_token_active',
+        'categories',
+        ['public_token'],
+        unique=False,
+        postgresql_where=sa.text('is_active = true')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_categories_public_token_active', table_name='categories')
@@ -0,0 +1,35 @@
+"""Add (category_id, submitted_at) index on payment_submissions
+
+Revision ID: 4c71b0e8d5a2
+Revises: e2d94b7f6c31
+Create Date: 2026-10-15 12:31:47.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c71b0e8d5a2'
+down_revision: Union[str, None] = 'e2d94b7f6c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # List and CSV export filter by category and order by submission time
+    op.create_index(
+        'ix_payment_submissions_cat_submitted',
+        'payment_submissions',
+        ['category_id', 'submitted_at'],
+        unique=False
+    )
+    # Covered by the leading category_id column of the composite indexes
+    op.drop_index(op.f('ix_payment_submissions_category_id'), table_name='payment_submissions')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_payment_submissions_category_id'), 'payment_submissions', ['category_id'], unique=False)
+    op.drop_index('ix_payment_submissions_cat_submitted', table_name='payment_submissions')
@@ -0,0 +1,53 @@
+"""Use time-ordered UUIDv7 primary keys
+
+Revision ID: 5d0b7a3e91c4
+Revises: cb1026090d1d
+Create Date: 2026-10-15 09:40:17.552031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0b7a3e91c4'
+down_revision: Union[str, None] = 'cb1026090d1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'categories', 'payment_submissions')
+
+
+def upgrade() -> None:
+    # UUIDv7: 48-bit millisecond timestamp prefix over a random v4 UUID.
+    # Existing rows keep their v4 IDs; only new rows are time-ordered.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            placing substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+    """)
+
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('uuid_generate_v7()'))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=None)
+
+    op.execute('DROP FUNCTION IF EXISTS uuid_generate_v7()')
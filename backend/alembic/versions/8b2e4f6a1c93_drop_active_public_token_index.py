@@ -0,0 +1,33 @@
+"""Drop partial index on active categories by public token
+
+Revision ID: 8b2e4f6a1c93
+Revises: 4c71b0e8d5a2
+Create Date: 2026-10-15 14:05:22.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a1c93'
+down_revision: Union[str, None] = '4c71b0e8d5a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The unique constraint's index already serves the token equality lookup
+    op.drop_index('ix_categories_public_token_active', table_name='categories')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_categories_public_token_active',
+        'categories',
+        ['public_token'],
+        unique=False,
+        postgresql_where=sa.text('is_active = true')
+    )
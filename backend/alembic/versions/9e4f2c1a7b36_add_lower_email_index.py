@@ -0,0 +1,27 @@
+"""Add case-insensitive index on users.email
+
+Revision ID: 9e4f2c1a7b36
+Revises: 5d0b7a3e91c4
+Create Date: 2026-10-15 10:05:52.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4f2c1a7b36'
+down_revision: Union[str, None] = '5d0b7a3e91c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Login and registration look users up by lower(email)
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_lower', table_name='users')
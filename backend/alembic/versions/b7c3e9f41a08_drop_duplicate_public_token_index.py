@@ -0,0 +1,27 @@
+"""Drop duplicate non-unique index on categories.public_token
+
+Revision ID: b7c3e9f41a08
+Revises: 3f8a6d2b0e57
+Create Date: 2026-10-15 11:20:36.770145
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e9f41a08'
+down_revision: Union[str, None] = '3f8a6d2b0e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The unique constraint on public_token already provides an index for lookups
+    op.drop_index(op.f('ix_categories_public_token'), table_name='categories')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_categories_public_token'), 'categories', ['public_token'], unique=False)
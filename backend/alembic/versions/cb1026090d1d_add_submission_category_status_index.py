@@ -0,0 +1,30 @@
+"""Add composite (category_id, status) index on payment_submissions
+
+Revision ID: cb1026090d1d
+Revises: afcfe0590005
+Create Date: 2026-10-15 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cb1026090d1d'
+down_revision: Union[str, None] = 'afcfe0590005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Submission counts filter by category and group by status
+    op.create_index('ix_payment_submissions_category_status', 'payment_submissions', ['category_id', 'status'], unique=False)
+    # Status is never queried without a category, so the single-column index is redundant
+    op.drop_index(op.f('ix_payment_submissions_status'), table_name='payment_submissions')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_payment_submissions_status'), 'payment_submissions', ['status'], unique=False)
+    op.drop_index('ix_payment_submissions_category_status', table_name='payment_submissions')
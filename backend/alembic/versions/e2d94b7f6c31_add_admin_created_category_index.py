@@ -0,0 +1,35 @@
+"""Add (admin_id, created_at DESC) index on categories
+
+Revision ID: e2d94b7f6c31
+Revises: 0a6e5d8c2f19
+Create Date: 2026-10-15 12:02:11.658930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d94b7f6c31'
+down_revision: Union[str, None] = '0a6e5d8c2f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Category list filters by admin and orders by newest first
+    op.create_index(
+        'ix_categories_admin_created',
+        'categories',
+        ['admin_id', sa.text('created_at DESC')],
+        unique=False
+    )
+    # Covered by the leading admin_id column of the new index
+    op.drop_index(op.f('ix_categories_admin_id'), table_name='categories')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_categories_admin_id'), 'categories', ['admin_id'], unique=False)
+    op.drop_index('ix_categories_admin_created', table_name='categories')
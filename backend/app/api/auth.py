@@ -2,11 +2,18 @@
 Authentication endpoints for user registration, login, and token refresh.
 Admin-only authentication system (students don't need accounts).
 """
+import os
+from typing import Optional
+from uuid import UUID
+
+from anyio import CapacityLimiter, to_thread
 from fastapi import APIRouter, Depends, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, func, insert, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
+from app.core.security import verify_password, verify_and_update_password, get_password_hash, create_access_token, create_refresh_token, decode_token
 from app.core.exceptions import AuthenticationError, ConflictError
 from app.database import get_db
 from app.models.user import User
@@ -14,9 +21,36 @@ from app.schemas.auth import RegisterRequest, LoginRequest, RefreshTokenRequest,
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
+# Verified against when the email is unknown so both login paths pay for one hash check.
+# Uses the default scheme (argon2id), which every account converges on as legacy
+# bcrypt hashes are upgraded at login, so unknown emails time like migrated accounts
+DUMMY_HASH = get_password_hash("dummy-password")
+
+# Password hashing is CPU-bound: at most one hash per core, counted against this
+# limiter instead of the 40 tokens FastAPI's threadpool shares with sync endpoints
+password_hash_limiter = CapacityLimiter(os.cpu_count() or 1)
+
+
+def _find_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Load a user by lowercased email (case-insensitive match)."""
+    return db.query(User).filter(func.lower(User.email) == email).first()
+
+
+def _create_user(db: Session, name: str, email: str, password_hash: str):
+    """Insert a user and commit, returning its id (RETURNING avoids a follow-up SELECT)."""
+    user = db.execute(
+        insert(User).values(
+            name=name,
+            email=email,
+            password_hash=password_hash
+        ).returning(User.id, User.created_at)
+    ).one()
+    db.commit()
+    return user
+
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, db: Session = Depends(get_db)):
     """
     Register a new admin user.
 
@@ -32,21 +66,17 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     Raises:
         ConflictError: If email is already registered
     """
-    # Check if email already exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    email = request.email.lower()
+
+    # Check if email already exists (database calls run in the threadpool, off the event loop)
+    existing_user = await run_in_threadpool(_find_user_by_email, db, email)
     if existing_user:
         raise ConflictError(detail="Email already registered")
 
-    # Create new user with hashed password
-    user = User(
-        name=request.name,
-        email=request.email,
-        password_hash=get_password_hash(request.password)
-    )
+    password_hash = await to_thread.run_sync(get_password_hash, request.password, limiter=password_hash_limiter)
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    # Create new user with hashed password
+    user = await run_in_threadpool(_create_user, db, request.name, email, password_hash)
 
     # Generate JWT tokens
     access_token = create_access_token(data={"sub": str(user.id)})
@@ -60,7 +90,7 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: Session = Depends(get_db)):
     """
     Authenticate user and return JWT tokens.
 
@@ -76,13 +106,25 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
     Raises:
         AuthenticationError: If credentials are invalid
     """
-    # Find user by email
-    user = db.query(User).filter(User.email == request.email).first()
+    # Find user by email (case-insensitive)
+    user = await run_in_threadpool(_find_user_by_email, db, request.email.lower())
 
-    # Verify user exists and password is correct
-    if not user or not verify_password(request.password, user.password_hash):
+    # Always run the password check so unknown emails take as long as wrong passwords
+    if user is None:
+        await to_thread.run_sync(verify_password, request.password, DUMMY_HASH, limiter=password_hash_limiter)
         raise AuthenticationError(detail="Incorrect email or password")
 
+    valid, new_hash = await to_thread.run_sync(
+        verify_and_update_password, request.password, user.password_hash, limiter=password_hash_limiter
+    )
+    if not valid:
+        raise AuthenticationError(detail="Incorrect email or password")
+
+    # Upgrade legacy bcrypt hashes to argon2id on successful login
+    if new_hash:
+        user.password_hash = new_hash
+        await run_in_threadpool(db.commit)
+
     # Generate JWT tokens
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
@@ -125,16 +167,18 @@ def refresh_access_token(request: RefreshTokenRequest, db: Session = Depends(get
         if user_id is None:
             raise AuthenticationError(detail="Invalid token payload")
 
+        user_uuid = UUID(user_id)
+
     except Exception as e:
         raise AuthenticationError(detail=f"Could not validate refresh token: {str(e)}")
 
-    # Verify user still exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # Verify user still exists (EXISTS probe, no row is loaded)
+    user_exists = db.scalar(select(exists().where(User.id == user_uuid)))
+    if not user_exists:
         raise AuthenticationError(detail="User not found")
 
     # Issue new access token
-    new_access_token = create_access_token(data={"sub": str(user.id)})
+    new_access_token = create_access_token(data={"sub": str(user_uuid)})
 
     return TokenResponse(
         access_token=new_access_token,
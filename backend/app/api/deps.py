@@ -2,24 +2,93 @@
 Dependency injection functions for FastAPI routes.
 Provides database sessions, current user extraction, etc.
 """
+import hashlib
+import threading
+import time
 from typing import Generator
+from uuid import UUID
 
-from fastapi import Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TTLCache
+from fastapi import Depends, Request
+from fastapi.openapi.models import HTTPBearer as HTTPBearerModel
+from fastapi.security.base import SecurityBase
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.core.security import decode_token
 from app.core.exceptions import AuthenticationError
 from app.database import get_db
 from app.models.user import User
 
+# Recently authenticated tokens: sha256(token) -> (expiry timestamp, user column values).
+# Keyed by digest so raw tokens are never kept in memory.
+_token_cache: TTLCache = TTLCache(maxsize=4096, ttl=30)
+_token_cache_lock = threading.Lock()
+
+
+def _cached_user(key: bytes, db: Session) -> User | None:
+    """Return the cached user for a token digest, attached to the given session."""
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+
+    if cached is None:
+        return None
+
+    expires_at, user_data = cached
+    if expires_at <= time.time():
+        with _token_cache_lock:
+            _token_cache.pop(key, None)
+        return None
+
+    # Rebuild the user as a detached instance and attach it without a SELECT
+    user = User(**user_data)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+class BearerToken(SecurityBase):
+    """
+    HTTP Bearer security scheme that reads the token straight from the header.
+
+    Registered like fastapi's HTTPBearer, so the OpenAPI spec (and the /docs
+    Authorize button) still describes bearer auth, but the header is sliced
+    directly instead of building HTTPAuthorizationCredentials.
+    """
+
+    def __init__(self):
+        self.model = HTTPBearerModel()
+        self.scheme_name = "HTTPBearer"
+
+    def __call__(self, request: Request) -> str:
+        """
+        Extract the bearer token from the Authorization header.
+
+        Args:
+            request: Incoming HTTP request
+
+        Returns:
+            Raw token string
+
+        Raises:
+            AuthenticationError: If the header is missing or not a bearer token
+        """
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            raise AuthenticationError(detail="Not authenticated")
+
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise AuthenticationError(detail="Invalid authentication scheme")
+
+        return token
+
+
 # HTTP Bearer token security scheme
-security = HTTPBearer()
+security = BearerToken()
 
 
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token: str = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """
@@ -28,17 +97,22 @@ def get_current_user(
     This dependency is used to protect admin endpoints that require authentication.
 
     Args:
-        credentials: HTTP Bearer token from Authorization header
+        token: Bearer token from the Authorization header
         db: Database session
 
     Returns:
         User object of authenticated user
 
     Raises:
-        AuthenticationError: If token is invalid, expired, or user not found
+        AuthenticationError: If token is missing, invalid, expired, or user not found
     """
+    cache_key = hashlib.sha256(token.encode()).digest()
+
+    user = _cached_user(cache_key, db)
+    if user is not None:
+        return user
+
     try:
-        token = credentials.credentials
         payload = decode_token(token)
 
         # Validate token type
@@ -51,19 +125,26 @@ def get_current_user(
         if user_id is None:
             raise AuthenticationError(detail="Invalid token payload")
 
-    except JWTError as e:
+        # Bind as a UUID so the primary key index is used
+        user_uuid = UUID(user_id)
+
+    except (JWTError, ValueError) as e:
         raise AuthenticationError(detail=f"Could not validate credentials: {str(e)}")
 
-    # Fetch user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Fetch user by primary key (served from the identity map when already loaded)
+    user = db.get(User, user_uuid)
     if user is None:
         raise AuthenticationError(detail="User not found")
 
+    user_data = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+    with _token_cache_lock:
+        _token_cache[cache_key] = (payload["exp"], user_data)
+
     return user
 
 
 def get_current_user_optional(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    request: Request,
     db: Session = Depends(get_db)
 ) -> User | None:
     """
@@ -72,13 +153,34 @@ def get_current_user_optional(
     Use this for endpoints that work both authenticated and unauthenticated.
 
     Args:
-        credentials: Optional HTTP Bearer token
+        request: Incoming HTTP request (bearer token optional)
         db: Database session
 
     Returns:
         User object if authenticated, None otherwise
     """
     try:
-        return get_current_user(credentials, db)
+        return get_current_user(security(request), db)
     except AuthenticationError:
         return None
+
+
+def get_read_only_db(db: Session = Depends(get_db)) -> Session:
+    """
+    Provide the request's database session in read-only mode.
+
+    On PostgreSQL the session's next transaction starts as BEGIN READ ONLY
+    (psycopg2's readonly flag, reset when the connection returns to the pool),
+    so read endpoints never hold a write-capable transaction. Other databases
+    ignore the option.
+
+    Args:
+        db: Database session (shared with get_current_user within a request)
+
+    Returns:
+        The same session, with a read-only transaction begun
+    """
+    # End any transaction begun while authenticating; READ ONLY applies from BEGIN
+    db.commit()
+    db.connection(execution_options={"postgresql_readonly": True})
+    return db
@@ -2,26 +2,39 @@
 Public endpoints for student payment submissions.
 These endpoints don't require authentication - students access via public token.
 """
-from datetime import datetime, timezone
+import logging
 
 from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from sqlalchemy import bindparam, func, lambda_stmt, or_, select
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import NotFoundError, BadRequestError
+from app.core.ids import uuid7
 from app.database import get_db
 from app.models.category import Category
 from app.models.submission import PaymentSubmission, SubmissionStatus
 from app.schemas.submission import PublicCategoryResponse, PublicSubmissionResponse
 from app.services.storage_service import (
-    storage_service,
+    get_storage_service,
     validate_file_extension,
     validate_file_size,
     generate_receipt_key
 )
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/public", tags=["public"])
 
+# Cached statement for the active, unexpired category lookup by public token
+_active_category_by_token_stmt = lambda_stmt(
+    lambda: select(Category).where(
+        Category.public_token == bindparam("token"),
+        Category.is_active.is_(True),
+        or_(Category.expires_at.is_(None), Category.expires_at > func.now())
+    )
+)
+
 
 @router.get("/categories/{token}", response_model=PublicCategoryResponse)
 def get_public_category(token: str, db: Session = Depends(get_db)):
@@ -41,28 +54,21 @@ def get_public_category(token: str, db: Session = Depends(get_db)):
     Raises:
         NotFoundError: If category not found, inactive, or expired
     """
-    category = db.query(Category).filter(
-        Category.public_token == token,
-        Category.is_active == True
-    ).first()
+    category = db.execute(_active_category_by_token_stmt, {"token": token}).scalar_one_or_none()
 
     if not category:
-        raise NotFoundError(detail="Category not found or no longer active")
-
-    # Check if category has expired
-    if category.expires_at and category.expires_at < datetime.now(timezone.utc):
-        raise NotFoundError(detail="This category has expired and is no longer accepting submissions")
+        raise NotFoundError(detail="Category not found, inactive, or expired")
 
-    return PublicCategoryResponse(
+    return PublicCategoryResponse.model_construct(
         id=category.id,
         title=category.title,
         description=category.description,
-        amount_expected=category.amount_expected
+        amount_expected=float(category.amount_expected) if category.amount_expected is not None else None
     )
 
 
 @router.post("/categories/{token}/submissions", response_model=PublicSubmissionResponse, status_code=status.HTTP_201_CREATED)
-async def submit_payment(
+def submit_payment(
     token: str,
     student_name: str = Form(..., min_length=2, max_length=255),
     student_phone: str = Form(..., min_length=5, max_length=20),
@@ -75,6 +81,8 @@ async def submit_payment(
 
     Students fill out a form with their details and upload a receipt.
     The submission is created with 'pending' status for admin review.
+    Declared sync so FastAPI runs it in the threadpool: the database calls and
+    the blocking S3 upload never stall the event loop.
 
     Args:
         token: Public token from the shareable link
@@ -88,54 +96,59 @@ async def submit_payment(
         PublicSubmissionResponse with submission ID and status
 
     Raises:
-        NotFoundError: If category not found or expired
+        NotFoundError: If category not found, inactive, or expired
         BadRequestError: If file validation fails
     """
-    # Validate category exists and is active
-    category = db.query(Category).filter(
-        Category.public_token == token,
-        Category.is_active == True
-    ).first()
+    # Validate category exists, is active, and has not expired
+    category = db.execute(_active_category_by_token_stmt, {"token": token}).scalar_one_or_none()
 
     if not category:
-        raise NotFoundError(detail="Category not found or no longer active")
-
-    # Check expiration
-    if category.expires_at and category.expires_at < datetime.now(timezone.utc):
-        raise BadRequestError(detail="This category has expired and is no longer accepting submissions")
+        raise NotFoundError(detail="Category not found, inactive, or expired")
 
-    # Validate file extension
+    # Validate file extension and size (the upload is already spooled locally)
     validate_file_extension(receipt.filename)
+    receipt_size = validate_file_size(receipt.file, settings.MAX_UPLOAD_SIZE, receipt.size)
+
+    # End the read transaction so no connection is held during the upload
+    db.commit()
 
-    # Validate file size
-    validate_file_size(receipt.file, max_size=settings.MAX_UPLOAD_SIZE)
+    # Generate the submission ID up front so the receipt can be uploaded first
+    submission_id = uuid7()
+    receipt_key = generate_receipt_key(category.id, submission_id, receipt.filename)
+
+    try:
+        # Upload file
+        get_storage_service().upload_file(receipt.file, receipt_key, receipt.content_type, receipt_size)
 
-    # Create submission record first (to get ID for S3 key)
+    except BadRequestError:
+        raise
+
+    except Exception as e:
+        raise BadRequestError(detail=f"File upload failed: {str(e)}")
+
+    # Create submission record with the uploaded receipt in a single INSERT
     submission = PaymentSubmission(
+        id=submission_id,
         category_id=category.id,
         student_name=student_name,
         student_phone=student_phone,
         amount_paid=amount_paid,
-        receipt_url="",  # Placeholder, will update after upload
+        receipt_url=receipt_key,
         status=SubmissionStatus.PENDING
     )
 
     db.add(submission)
-    db.flush()  # Get submission ID without committing
-
     try:
-        # Generate S3 key and upload file
-        receipt_key = generate_receipt_key(category.id, submission.id, receipt.filename)
-        storage_service.upload_file(receipt.file, receipt_key, receipt.content_type)
-
-        # Update submission with S3 key
-        submission.receipt_url = receipt_key
         db.commit()
-        db.refresh(submission)
-
-    except Exception as e:
+    except Exception:
+        # No row will reference the uploaded receipt, so remove it
         db.rollback()
-        raise BadRequestError(detail=f"File upload failed: {str(e)}")
+        try:
+            get_storage_service().delete_file(receipt_key)
+        except Exception:
+            # Keep the original error; record the key so the object can be removed later
+            logger.exception("Could not delete orphaned receipt %s", receipt_key)
+        raise
 
     return PublicSubmissionResponse(
         id=submission.id,
@@ -2,78 +2,149 @@
 Admin submission management endpoints.
 Allows admins to view, confirm, reject submissions and export to CSV.
 """
+import base64
+import binascii
 import csv
+import hashlib
 import io
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import exists, func, select, tuple_
+from sqlalchemy.orm import Session, contains_eager
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_only_db
 from app.core.exceptions import NotFoundError, BadRequestError
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models.user import User
 from app.models.category import Category
 from app.models.submission import PaymentSubmission, SubmissionStatus
 from app.schemas.submission import SubmissionResponse, ConfirmSubmissionRequest, RejectSubmissionRequest
-from app.services.storage_service import storage_service
+from app.services.storage_service import get_storage_service
 
 router = APIRouter(prefix="/api", tags=["submissions"])
 
+# Enum members are singletons (and the Enum column loads members), so compare by identity
+_PENDING = SubmissionStatus.PENDING
+
+# Built once: serializes a whole page of responses straight to JSON bytes
+SUBMISSION_LIST_ADAPTER = TypeAdapter(List[SubmissionResponse])
+
+CSV_HEADER = [
+    "ID",
+    "Student Name",
+    "Phone",
+    "Amount Paid",
+    "Status",
+    "Submitted At",
+    "Reviewed At",
+    "Reviewed By",
+    "Admin Note",
+    "Receipt URL"
+]
+
+
+def _serialize(submission: PaymentSubmission, signed_url: str) -> SubmissionResponse:
+    """Build the response for a submission (values come from the database, so no re-validation)."""
+    return SubmissionResponse.model_construct(
+        id=submission.id,
+        category_id=submission.category_id,
+        student_name=submission.student_name,
+        student_phone=submission.student_phone,
+        amount_paid=float(submission.amount_paid),
+        receipt_url=submission.receipt_url,
+        receipt_signed_url=signed_url,
+        status=submission.status,
+        admin_note=submission.admin_note,
+        submitted_at=submission.submitted_at,
+        reviewed_at=submission.reviewed_at,
+        reviewed_by=submission.reviewed_by
+    )
 
-def get_category_by_id_and_owner(category_id: UUID, user: User, db: Session) -> Category:
-    """Helper to fetch category and verify ownership."""
-    category = db.query(Category).filter(
-        Category.id == category_id,
-        Category.admin_id == user.id
-    ).first()
 
-    if not category:
-        raise NotFoundError(detail="Category not found or access denied")
+def ensure_category_owner(category_id: UUID, user: User, db: Session) -> None:
+    """Raise NotFoundError unless the user owns the category (EXISTS probe)."""
+    owned = db.scalar(
+        select(exists().where(Category.id == category_id, Category.admin_id == user.id))
+    )
 
-    return category
+    if not owned:
+        raise NotFoundError(detail="Category not found or access denied")
 
 
 def get_submission_with_category_check(submission_id: UUID, user: User, db: Session) -> PaymentSubmission:
-    """Fetch submission and verify user owns the category."""
-    submission = db.query(PaymentSubmission).filter(
-        PaymentSubmission.id == submission_id
-    ).first()
-
-    if not submission:
-        raise NotFoundError(detail="Submission not found")
+    """Fetch submission and verify user owns the category (single JOIN query).
 
-    # Verify user owns the category
-    category = db.query(Category).filter(
-        Category.id == submission.category_id,
+    The joined category row also populates submission.category, so reading it
+    later does not trigger a lazy load.
+    """
+    submission = db.query(PaymentSubmission).join(
+        PaymentSubmission.category
+    ).options(
+        contains_eager(PaymentSubmission.category)
+    ).filter(
+        PaymentSubmission.id == submission_id,
         Category.admin_id == user.id
     ).first()
 
-    if not category:
+    if not submission:
         raise NotFoundError(detail="Submission not found or access denied")
 
     return submission
 
 
+def encode_cursor(submission: PaymentSubmission) -> str:
+    """Encode a submission's (submitted_at, id) sort key as an opaque cursor."""
+    raw = f"{submission.submitted_at.isoformat()},{submission.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        submitted_at, submission_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(",")
+        return datetime.fromisoformat(submitted_at), UUID(submission_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestError(detail="Invalid cursor")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
 @router.get("/categories/{category_id}/submissions", response_model=List[SubmissionResponse])
 def list_submissions(
     category_id: UUID,
     status_filter: Optional[SubmissionStatus] = Query(None, description="Filter by status"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of submissions to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_only_db)
 ):
     """
-    List all submissions for a category.
+    List submissions for a category, newest first, one page at a time.
 
     Only the category owner can access submissions.
     Optionally filter by status (pending, confirmed, rejected).
+    Pages are keyset-paginated: when more rows exist, the X-Next-Cursor header
+    holds the cursor for the next page. Responses carry an ETag; a matching
+    If-None-Match returns 304 without loading rows or signing URLs.
 
     Args:
         category_id: ID of the category
         status_filter: Optional status filter
+        limit: Page size (max 500)
+        cursor: Opaque cursor from the previous page's X-Next-Cursor header
+        if_none_match: ETag from a previous response
         current_user: Authenticated admin user
         db: Database session
 
@@ -82,47 +153,78 @@ def list_submissions(
 
     Raises:
         NotFoundError: If category not found or user doesn't own it
+        BadRequestError: If the cursor is malformed
     """
-    # Verify category ownership
-    category = get_category_by_id_and_owner(category_id, current_user, db)
+    # Category ownership is checked in the same queries
+    filters = [
+        PaymentSubmission.category_id == category_id,
+        Category.admin_id == current_user.id
+    ]
+    if status_filter:
+        filters.append(PaymentSubmission.status == status_filter)
+
+    # Fingerprint the result set: rows are only ever added or reviewed
+    row_count, last_submitted, last_reviewed = db.query(
+        func.count(PaymentSubmission.id),
+        func.max(PaymentSubmission.submitted_at),
+        func.max(PaymentSubmission.reviewed_at)
+    ).join(
+        Category, Category.id == PaymentSubmission.category_id
+    ).filter(*filters).one()
+
+    # No rows: either an empty category or not the user's category
+    if not row_count:
+        ensure_category_owner(category_id, current_user, db)
+
+    # Include the signing window so clients never keep URLs past half their lifetime
+    fingerprint = f"{row_count}:{last_submitted}:{last_reviewed}:{get_storage_service().presign_window()}"
+    etag = f'"{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}"'
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    headers = {"ETag": etag}
+
+    if not row_count:
+        return Response(content=b"[]", media_type="application/json", headers=headers)
+
+    query = db.query(PaymentSubmission).join(
+        Category, Category.id == PaymentSubmission.category_id
+    ).filter(*filters)
+
+    # Keyset pagination: continue strictly after the last row of the previous page
+    if cursor:
+        query = query.filter(
+            tuple_(PaymentSubmission.submitted_at, PaymentSubmission.id) < decode_cursor(cursor)
+        )
 
-    # Query submissions
-    query = db.query(PaymentSubmission).filter(
-        PaymentSubmission.category_id == category_id
-    )
+    # One extra row tells whether another page follows
+    submissions = query.order_by(
+        PaymentSubmission.submitted_at.desc(),
+        PaymentSubmission.id.desc()
+    ).limit(limit + 1).all()
 
-    if status_filter:
-        query = query.filter(PaymentSubmission.status == status_filter)
-
-    submissions = query.order_by(PaymentSubmission.submitted_at.desc()).all()
-
-    # Add signed URLs for receipts
-    result = []
-    for sub in submissions:
-        sub_dict = {
-            "id": sub.id,
-            "category_id": sub.category_id,
-            "student_name": sub.student_name,
-            "student_phone": sub.student_phone,
-            "amount_paid": sub.amount_paid,
-            "receipt_url": sub.receipt_url,
-            "receipt_signed_url": storage_service.generate_presigned_url(sub.receipt_url),
-            "status": sub.status,
-            "admin_note": sub.admin_note,
-            "submitted_at": sub.submitted_at,
-            "reviewed_at": sub.reviewed_at,
-            "reviewed_by": sub.reviewed_by
-        }
-        result.append(SubmissionResponse(**sub_dict))
+    if len(submissions) > limit:
+        submissions = submissions[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(submissions[-1])
+
+    # Sign all receipt URLs in one batch
+    signed_urls = get_storage_service().generate_presigned_urls_bulk(
+        [sub.receipt_url for sub in submissions]
+    )
 
-    return result
+    page = [_serialize(sub, signed_url) for sub, signed_url in zip(submissions, signed_urls)]
+    return Response(
+        content=SUBMISSION_LIST_ADAPTER.dump_json(page),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @router.get("/submissions/{submission_id}", response_model=SubmissionResponse)
 def get_submission(
     submission_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_only_db)
 ):
     """
     Get a single submission by ID.
@@ -142,20 +244,7 @@ def get_submission(
     """
     submission = get_submission_with_category_check(submission_id, current_user, db)
 
-    return SubmissionResponse(
-        id=submission.id,
-        category_id=submission.category_id,
-        student_name=submission.student_name,
-        student_phone=submission.student_phone,
-        amount_paid=submission.amount_paid,
-        receipt_url=submission.receipt_url,
-        receipt_signed_url=storage_service.generate_presigned_url(submission.receipt_url),
-        status=submission.status,
-        admin_note=submission.admin_note,
-        submitted_at=submission.submitted_at,
-        reviewed_at=submission.reviewed_at,
-        reviewed_by=submission.reviewed_by
-    )
+    return _serialize(submission, get_storage_service().generate_presigned_url(submission.receipt_url))
 
 
 @router.patch("/submissions/{submission_id}/confirm", response_model=SubmissionResponse)
@@ -186,7 +275,7 @@ def confirm_submission(
     submission = get_submission_with_category_check(submission_id, current_user, db)
 
     # Validate status transition
-    if submission.status != SubmissionStatus.PENDING:
+    if submission.status is not _PENDING:
         raise BadRequestError(
             detail=f"Cannot confirm submission with status '{submission.status.value}'. Only pending submissions can be confirmed."
         )
@@ -194,26 +283,12 @@ def confirm_submission(
     # Update submission
     submission.status = SubmissionStatus.CONFIRMED
     submission.admin_note = request.admin_note
-    submission.reviewed_at = datetime.utcnow()
+    submission.reviewed_at = datetime.now(timezone.utc)
     submission.reviewed_by = current_user.id
 
     db.commit()
-    db.refresh(submission)
 
-    return SubmissionResponse(
-        id=submission.id,
-        category_id=submission.category_id,
-        student_name=submission.student_name,
-        student_phone=submission.student_phone,
-        amount_paid=submission.amount_paid,
-        receipt_url=submission.receipt_url,
-        receipt_signed_url=storage_service.generate_presigned_url(submission.receipt_url),
-        status=submission.status,
-        admin_note=submission.admin_note,
-        submitted_at=submission.submitted_at,
-        reviewed_at=submission.reviewed_at,
-        reviewed_by=submission.reviewed_by
-    )
+    return _serialize(submission, get_storage_service().generate_presigned_url(submission.receipt_url))
 
 
 @router.patch("/submissions/{submission_id}/reject", response_model=SubmissionResponse)
@@ -245,7 +320,7 @@ def reject_submission(
     submission = get_submission_with_category_check(submission_id, current_user, db)
 
     # Validate status transition
-    if submission.status != SubmissionStatus.PENDING:
+    if submission.status is not _PENDING:
         raise BadRequestError(
             detail=f"Cannot reject submission with status '{submission.status.value}'. Only pending submissions can be rejected."
         )
@@ -253,33 +328,19 @@ def reject_submission(
     # Update submission
     submission.status = SubmissionStatus.REJECTED
     submission.admin_note = request.admin_note
-    submission.reviewed_at = datetime.utcnow()
+    submission.reviewed_at = datetime.now(timezone.utc)
     submission.reviewed_by = current_user.id
 
     db.commit()
-    db.refresh(submission)
 
-    return SubmissionResponse(
-        id=submission.id,
-        category_id=submission.category_id,
-        student_name=submission.student_name,
-        student_phone=submission.student_phone,
-        amount_paid=submission.amount_paid,
-        receipt_url=submission.receipt_url,
-        receipt_signed_url=storage_service.generate_presigned_url(submission.receipt_url),
-        status=submission.status,
-        admin_note=submission.admin_note,
-        submitted_at=submission.submitted_at,
-        reviewed_at=submission.reviewed_at,
-        reviewed_by=submission.reviewed_by
-    )
+    return _serialize(submission, get_storage_service().generate_presigned_url(submission.receipt_url))
 
 
 @router.get("/categories/{category_id}/export.csv")
 def export_submissions_csv(
     category_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_only_db)
 ):
     """
     Export all submissions for a category as CSV.
@@ -297,54 +358,70 @@ def export_submissions_csv(
     Raises:
         NotFoundError: If category not found or user doesn't own it
     """
-    # Verify category ownership
-    category = get_category_by_id_and_owner(category_id, current_user, db)
-
-    # Fetch all submissions
-    submissions = db.query(PaymentSubmission).filter(
+    # Checked up front: once streaming starts the status code is already sent
+    ensure_category_owner(category_id, current_user, db)
+
+    # Only the exported columns, as plain rows (no ORM instances)
+    stmt = select(
+        PaymentSubmission.id,
+        PaymentSubmission.student_name,
+        PaymentSubmission.student_phone,
+        PaymentSubmission.amount_paid,
+        PaymentSubmission.status,
+        PaymentSubmission.submitted_at,
+        PaymentSubmission.reviewed_at,
+        PaymentSubmission.reviewed_by,
+        PaymentSubmission.admin_note,
+        PaymentSubmission.receipt_url
+    ).where(
         PaymentSubmission.category_id == category_id
-    ).order_by(PaymentSubmission.submitted_at.asc()).all()
-
-    # Generate CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow([
-        "ID",
-        "Student Name",
-        "Phone",
-        "Amount Paid",
-        "Status",
-        "Submitted At",
-        "Reviewed At",
-        "Reviewed By",
-        "Admin Note",
-        "Receipt URL"
-    ])
-
-    # Write data rows
-    for sub in submissions:
-        writer.writerow([
-            sub.id,
-            sub.student_name,
-            sub.student_phone,
-            str(sub.amount_paid),
-            sub.status.value,
-            sub.submitted_at.isoformat() if sub.submitted_at else "",
-            sub.reviewed_at.isoformat() if sub.reviewed_at else "",
-            sub.reviewed_by if sub.reviewed_by else "",
-            sub.admin_note or "",
-            sub.receipt_url
-        ])
-
-    output.seek(0)
+    ).order_by(
+        PaymentSubmission.submitted_at.asc()
+    ).execution_options(yield_per=500)
+
+    def iter_csv():
+        """Yield the CSV header, then one chunk per batch of fetched rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush() -> str:
+            line = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return line
+
+        # The request session is closed before the body is sent, so the
+        # stream reads through its own read-only session
+        export_db = SessionLocal()
+        try:
+            export_db.connection(execution_options={"postgresql_readonly": True})
+            writer.writerow(CSV_HEADER)
+            yield flush()
+
+            # Server-side cursor: rows are fetched in batches instead of all at once
+            for partition in export_db.execute(stmt).partitions():
+                for sub in partition:
+                    writer.writerow([
+                        sub.id,
+                        sub.student_name,
+                        sub.student_phone,
+                        str(sub.amount_paid),
+                        sub.status.value,
+                        sub.submitted_at.isoformat() if sub.submitted_at else "",
+                        sub.reviewed_at.isoformat() if sub.reviewed_at else "",
+                        sub.reviewed_by if sub.reviewed_by else "",
+                        sub.admin_note or "",
+                        sub.receipt_url
+                    ])
+                yield flush()
+        finally:
+            export_db.close()
 
     # Return as downloadable CSV
-    filename = f"category_{category_id}_submissions_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
+    filename = f"category_{category_id}_submissions_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.csv"
 
     return StreamingResponse(
-        iter([output.getvalue()]),
+        iter_csv(),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -24,11 +24,15 @@ class Settings(BaseSettings):
     S3_SECRET_KEY: str = ""
     S3_BUCKET_NAME: str = "payment-receipts"
     S3_REGION: str = "us-east-1"
+    S3_ENSURE_BUCKET: bool = True  # Check/create the bucket on startup; disable once provisioned
 
     # File Upload Configuration
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB in bytes
     ALLOWED_EXTENSIONS: set = {".jpg", ".jpeg", ".png", ".pdf"}
 
+    # API documentation: include request/response examples in the OpenAPI schema
+    ENABLE_SCHEMA_EXAMPLES: bool = True
+
     # CORS Configuration
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:5173"]
 
@@ -0,0 +1,28 @@
+"""
+Identifier generation utilities.
+Provides time-ordered UUIDs for primary keys.
+"""
+import secrets
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits hold the Unix timestamp in milliseconds, so successive
+    IDs sort by creation time and new rows append to the right of the
+    primary key index instead of landing on random pages.
+
+    Returns:
+        A new version 7 UUID
+    """
+    unix_ts_ms = time.time_ns() // 1_000_000
+    value = (unix_ts_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(secrets.token_bytes(10), "big")
+
+    # Set version (0111) and variant (10) bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+
+    return uuid.UUID(int=value)
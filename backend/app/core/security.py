@@ -1,57 +1,71 @@
 """
 Security utilities for password hashing and JWT token management.
-Uses bcrypt for password hashing and python-jose for JWT.
+Uses argon2id for password hashing (bcrypt hashes still verify) and python-jose for JWT.
 """
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from sqlalchemy import Column
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple
 
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
 
-# Bcrypt context for password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use argon2id; legacy bcrypt hashes verify and are flagged for rehash
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
+# JWT key object built once; passing the raw secret makes python-jose rebuild it
+# (and attempt to parse it as a JWK) on every encode and decode
+_jwt_key = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
 
-def verify_password(plain_password: str, hashed_password: Column[str]) -> bool:
+
+def _truncate_password(password: str) -> str:
+    """Truncate a password to 72 bytes (the bcrypt limit) so it hashes and verifies the same under either scheme."""
+    return password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password.
 
     Args:
         plain_password: The plain text password from user input
-        hashed_password: The bcrypt hashed password from database
+        hashed_password: The argon2 or bcrypt hashed password from database
 
     Returns:
         True if password matches, False otherwise
     """
-    # Truncate to 72 bytes (bcrypt limit) for consistency with hashing
-    password_bytes = plain_password.encode('utf-8')[:72]
-    password_truncated = password_bytes.decode('utf-8', errors='ignore')
+    return pwd_context.verify(_truncate_password(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash is outdated.
 
-    hashed_password: str = hashed_password  # type: ignore
-    return pwd_context.verify(password_truncated, hashed_password)
+    Args:
+        plain_password: The plain text password from user input
+        hashed_password: The argon2 or bcrypt hashed password from database
+
+    Returns:
+        Tuple of (matches, new hash to store or None if the hash is current)
+    """
+    return pwd_context.verify_and_update(_truncate_password(plain_password), hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a plain password using bcrypt.
+    Hash a plain password using argon2id.
 
-    Bcrypt has a 72-byte password limit. Passwords are truncated to 72 bytes
-    as a defensive measure (validation should prevent this).
+    Passwords are truncated to 72 bytes, the limit of the legacy bcrypt
+    hashes, so the same input verifies under either scheme.
 
     Args:
         password: The plain text password to hash
 
     Returns:
-        Bcrypt hashed password string
+        Argon2id hashed password string
     """
-    # Truncate to 72 bytes (bcrypt limit) as defensive measure
-    # Validation should prevent this, but we handle it gracefully
-    password_bytes = password.encode('utf-8')[:72]
-    password_truncated = password_bytes.decode('utf-8', errors='ignore')
-    return pwd_context.hash(password_truncated)
+    # Validation should prevent over-long passwords, but we handle them gracefully
+    return pwd_context.hash(_truncate_password(password))
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -68,16 +82,16 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     to_encode = data.copy()
 
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({
         "exp": expire,
         "type": "access"
     })
 
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _jwt_key, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -92,14 +106,14 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         Encoded JWT token string
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
     to_encode.update({
         "exp": expire,
         "type": "refresh"
     })
 
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _jwt_key, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -116,5 +130,5 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         JWTError: If token is invalid or expired
     """
-    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    payload = jwt.decode(token, _jwt_key, algorithms=[settings.ALGORITHM])
     return payload
@@ -3,21 +3,42 @@ Database configuration and session management.
 Uses SQLAlchemy for ORM and connection pooling.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 from app.config import settings
 
+database_url = make_url(settings.DATABASE_URL)
+engine_options = {}
+
+if database_url.get_backend_name() == "sqlite":
+    # SQLite connections are cheap to open; pooling only causes thread issues
+    engine_options["poolclass"] = NullPool
+else:
+    # Sized for FastAPI's 40-thread pool running sync endpoints concurrently
+    engine_options.update(
+        pool_size=20,  # Number of connections to maintain
+        max_overflow=20,  # Maximum additional connections when pool is full
+        pool_timeout=30,  # Seconds to wait for a free connection
+        pool_recycle=1800,  # Replace connections older than 30 minutes
+    )
+
+# psycopg2: batch executemany UPDATE/DELETE statements as well as INSERTs
+if database_url.get_driver_name() == "psycopg2":
+    engine_options["executemany_mode"] = "values_plus_batch"
+
 # Create database engine with connection pooling
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using them
-    pool_size=5,  # Number of connections to maintain
-    max_overflow=10  # Maximum additional connections when pool is full
+    **engine_options
 )
 
 # Session factory for database operations
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,  # Keep loaded state after commit (no reload SELECT)
     bind=engine
 )
 
@@ -38,5 +59,9 @@ def get_db():
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        # Discard partial work from a failed request before releasing the connection
+        db.rollback()
+        raise
     finally:
         db.close()
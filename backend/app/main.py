@@ -4,7 +4,10 @@ Main entry point for the payment proof collection system.
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.config import settings
+from app.database import engine
 
 # Import routers
 from app.api import auth, categories, public, submissions
@@ -15,7 +18,8 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Payment Proof Collection System",
         description="System for course representatives to collect and verify student payment proofs",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=ORJSONResponse
     )
 
     # CORS middleware configuration
@@ -25,8 +29,12 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
+    # Compress JSON lists and CSV exports (streamed responses are compressed per chunk)
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
     # Include routers
     app.include_router(auth.router)
     app.include_router(categories.router)
@@ -37,7 +45,11 @@ def create_app() -> FastAPI:
     @app.get("/health", tags=["health"])
     def health_check():
         """Health check endpoint for monitoring."""
-        return {"status": "ok", "message": "Payment Proof System is running"}
+        return {
+            "status": "ok",
+            "message": "Payment Proof System is running",
+            "db_pool": engine.pool.status(),
+        }
 
     return app
 
@@ -2,11 +2,11 @@
 Category model for payment collections.
 Each category represents a specific payment event (e.g., "June Materials").
 """
-import uuid
-from sqlalchemy import Column, String, Text, Numeric, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Numeric, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from app.core.ids import uuid7
 from app.database import Base
 
 
@@ -17,16 +17,21 @@ class Category(Base):
     """
     __tablename__ = "categories"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    admin_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    admin_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     amount_expected = Column(Numeric(10, 2), nullable=True)  # Optional expected amount
-    public_token = Column(String(64), unique=True, nullable=False, index=True)  # Unguessable token for public access
+    public_token = Column(String(64), unique=True, nullable=False)  # Unguessable token for public access
     is_active = Column(Boolean, default=True, nullable=False)  # Soft delete flag
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=True)  # Optional expiration
 
+    __table_args__ = (
+        # Serves the admin's category list ordered newest first
+        Index("ix_categories_admin_created", admin_id, created_at.desc()),
+    )
+
     # Relationships
     admin = relationship("User", backref="categories")
     submissions = relationship("PaymentSubmission", back_populates="category", cascade="all, delete-orphan")
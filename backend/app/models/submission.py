@@ -2,12 +2,12 @@
 PaymentSubmission model for tracking student payment proofs.
 Implements immutable audit trail with strict state machine.
 """
-import uuid
 import enum
-from sqlalchemy import Column, String, Text, Numeric, Enum, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Numeric, Enum, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from app.core.ids import uuid7
 from app.database import Base
 
 
@@ -31,14 +31,18 @@ class PaymentSubmission(Base):
     Once reviewed, status cannot be changed (audit trail).
     """
     __tablename__ = "payment_submissions"
+    __table_args__ = (
+        Index("ix_payment_submissions_category_status", "category_id", "status"),
+        Index("ix_payment_submissions_cat_submitted", "category_id", "submitted_at"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
     student_name = Column(String(255), nullable=False)
     student_phone = Column(String(20), nullable=False)
     amount_paid = Column(Numeric(10, 2), nullable=False)
     receipt_url = Column(Text, nullable=False)  # S3 key, not full URL
-    status = Column(Enum(SubmissionStatus), default=SubmissionStatus.PENDING, nullable=False, index=True)
+    status = Column(Enum(SubmissionStatus), default=SubmissionStatus.PENDING, nullable=False)
     admin_note = Column(Text, nullable=True)  # Optional note when confirming/rejecting
     submitted_at = Column(DateTime(timezone=True), server_default=func.now())
     reviewed_at = Column(DateTime(timezone=True), nullable=True)  # Timestamp when status changed
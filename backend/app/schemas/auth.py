@@ -5,6 +5,8 @@ These define request and response models for auth operations.
 from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas.utils import schema_config
+
 
 class RegisterRequest(BaseModel):
     """Request model for user registration."""
@@ -12,7 +14,7 @@ class RegisterRequest(BaseModel):
     email: EmailStr = Field(..., description="User's email address")
     password: str = Field(..., min_length=8, max_length=72, description="User's password (max 72 chars due to bcrypt)")
 
-    model_config = {
+    model_config = schema_config({
         "json_schema_extra": {
             "examples": [
                 {
@@ -22,7 +24,7 @@ class RegisterRequest(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class LoginRequest(BaseModel):
@@ -30,7 +32,7 @@ class LoginRequest(BaseModel):
     email: EmailStr = Field(..., description="User's email address")
     password: str = Field(..., description="User's password")
 
-    model_config = {
+    model_config = schema_config({
         "json_schema_extra": {
             "examples": [
                 {
@@ -39,7 +41,7 @@ class LoginRequest(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class RefreshTokenRequest(BaseModel):
@@ -53,7 +55,7 @@ class TokenResponse(BaseModel):
     refresh_token: str = Field(..., description="JWT refresh token (7 day expiry)")
     token_type: str = Field(default="bearer", description="Token type")
 
-    model_config = {
+    model_config = schema_config({
         "json_schema_extra": {
             "examples": [
                 {
@@ -63,7 +65,7 @@ class TokenResponse(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class UserResponse(BaseModel):
@@ -72,7 +74,7 @@ class UserResponse(BaseModel):
     name: str = Field(..., description="User's full name")
     email: str = Field(..., description="User's email address")
 
-    model_config = {
+    model_config = schema_config({
         "from_attributes": True,
         "json_schema_extra": {
             "examples": [
@@ -83,4 +85,4 @@ class UserResponse(BaseModel):
                 }
             ]
         }
-    }
+    })
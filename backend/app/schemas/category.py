@@ -9,6 +9,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.schemas.utils import schema_config
+
 
 class CategoryCreate(BaseModel):
     """Request model for creating a new category."""
@@ -17,7 +19,7 @@ class CategoryCreate(BaseModel):
     amount_expected: Optional[Decimal] = Field(None, ge=0, description="Optional expected amount")
     expires_at: Optional[datetime] = Field(None, description="Optional expiration date/time")
 
-    model_config = {
+    model_config = schema_config({
         "json_schema_extra": {
             "examples": [
                 {
@@ -28,7 +30,7 @@ class CategoryCreate(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class CategoryUpdate(BaseModel):
@@ -38,7 +40,7 @@ class CategoryUpdate(BaseModel):
     amount_expected: Optional[Decimal] = Field(None, ge=0)
     expires_at: Optional[datetime] = None
 
-    model_config = {
+    model_config = schema_config({
         "json_schema_extra": {
             "examples": [
                 {
@@ -47,7 +49,7 @@ class CategoryUpdate(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class CategoryResponse(BaseModel):
@@ -56,18 +58,19 @@ class CategoryResponse(BaseModel):
     admin_id: UUID = Field(..., description="ID of admin who created this category")
     title: str = Field(..., description="Category title")
     description: Optional[str] = Field(None, description="Category description")
-    amount_expected: Optional[Decimal] = Field(None, description="Expected payment amount")
+    amount_expected: Optional[float] = Field(None, description="Expected payment amount")
     public_token: str = Field(..., description="Public token for submission link")
     is_active: bool = Field(..., description="Whether category is active")
     created_at: datetime = Field(..., description="Creation timestamp")
     expires_at: Optional[datetime] = Field(None, description="Expiration timestamp")
 
     # Submission counts (added dynamically in endpoint)
-    pending_count: Optional[int] = Field(0, description="Number of pending submissions")
-    confirmed_count: Optional[int] = Field(0, description="Number of confirmed submissions")
-    rejected_count: Optional[int] = Field(0, description="Number of rejected submissions")
+    pending_count: int = Field(0, description="Number of pending submissions")
+    confirmed_count: int = Field(0, description="Number of confirmed submissions")
+    rejected_count: int = Field(0, description="Number of rejected submissions")
 
-    model_config = {
+    model_config = schema_config({
+        "frozen": True,
         "from_attributes": True,
         "json_schema_extra": {
             "examples": [
@@ -87,7 +90,7 @@ class CategoryResponse(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class CategoryListResponse(BaseModel):
@@ -95,7 +98,8 @@ class CategoryListResponse(BaseModel):
     categories: list[CategoryResponse]
     total: int = Field(..., description="Total number of categories")
 
-    model_config = {
+    model_config = schema_config({
+        "frozen": True,
         "json_schema_extra": {
             "examples": [
                 {
@@ -104,4 +108,4 @@ class CategoryListResponse(BaseModel):
                 }
             ]
         }
-    }
+    })
@@ -3,13 +3,13 @@ Pydantic schemas for payment submission endpoints.
 These define request and response models for submission operations.
 """
 from datetime import datetime
-from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 from app.models.submission import SubmissionStatus
+from app.schemas.utils import schema_config
 
 
 class SubmissionResponse(BaseModel):
@@ -18,7 +18,7 @@ class SubmissionResponse(BaseModel):
     category_id: UUID = Field(..., description="Category ID")
     student_name: str = Field(..., description="Student's name")
     student_phone: str = Field(..., description="Student's phone number")
-    amount_paid: Decimal = Field(..., description="Amount paid")
+    amount_paid: float = Field(..., description="Amount paid")
     receipt_url: str = Field(..., description="Receipt S3 key")
     receipt_signed_url: Optional[str] = Field(None, description="Pre-signed URL for viewing receipt")
     status: SubmissionStatus = Field(..., description="Submission status")
@@ -27,7 +27,8 @@ class SubmissionResponse(BaseModel):
     reviewed_at: Optional[datetime] = Field(None, description="Review timestamp")
     reviewed_by: Optional[UUID] = Field(None, description="ID of admin who reviewed")
 
-    model_config = {
+    model_config = schema_config({
+        "frozen": True,
         "from_attributes": True,
         "json_schema_extra": {
             "examples": [
@@ -47,14 +48,14 @@ class SubmissionResponse(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class ConfirmSubmissionRequest(BaseModel):
     """Request model for confirming a submission."""
     admin_note: Optional[str] = Field(None, max_length=1000, description="Optional note about confirmation")
 
-    model_config = {
+    model_config = schema_config({
         "json_schema_extra": {
             "examples": [
                 {
@@ -62,14 +63,14 @@ class ConfirmSubmissionRequest(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class RejectSubmissionRequest(BaseModel):
     """Request model for rejecting a submission."""
     admin_note: str = Field(..., min_length=1, max_length=1000, description="Reason for rejection")
 
-    model_config = {
+    model_config = schema_config({
         "json_schema_extra": {
             "examples": [
                 {
@@ -77,7 +78,7 @@ class RejectSubmissionRequest(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class PublicCategoryResponse(BaseModel):
@@ -85,9 +86,10 @@ class PublicCategoryResponse(BaseModel):
     id: UUID = Field(..., description="Category ID")
     title: str = Field(..., description="Category title")
     description: Optional[str] = Field(None, description="Category description")
-    amount_expected: Optional[Decimal] = Field(None, description="Expected payment amount")
+    amount_expected: Optional[float] = Field(None, description="Expected payment amount")
 
-    model_config = {
+    model_config = schema_config({
+        "frozen": True,
         "from_attributes": True,
         "json_schema_extra": {
             "examples": [
@@ -99,7 +101,7 @@ class PublicCategoryResponse(BaseModel):
                 }
             ]
         }
-    }
+    })
 
 
 class PublicSubmissionResponse(BaseModel):
@@ -108,7 +110,8 @@ class PublicSubmissionResponse(BaseModel):
     status: str = Field(..., description="Submission status")
     message: str = Field(..., description="Success message")
 
-    model_config = {
+    model_config = schema_config({
+        "frozen": True,
         "json_schema_extra": {
             "examples": [
                 {
@@ -118,4 +121,4 @@ class PublicSubmissionResponse(BaseModel):
                 }
             ]
         }
-    }
+    })
@@ -0,0 +1,22 @@
+"""
+Shared helpers for Pydantic schema definitions.
+"""
+from app.config import settings
+
+
+def schema_config(config: dict) -> dict:
+    """
+    Build a model_config, dropping OpenAPI examples when they are disabled.
+
+    Examples only document the API; with ENABLE_SCHEMA_EXAMPLES off (production)
+    they are left out of the generated schema and /openapi.json.
+
+    Args:
+        config: Pydantic model_config dictionary
+
+    Returns:
+        The config, without json_schema_extra if examples are disabled
+    """
+    if settings.ENABLE_SCHEMA_EXAMPLES:
+        return config
+    return {key: value for key, value in config.items() if key != "json_schema_extra"}
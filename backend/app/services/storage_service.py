@@ -3,17 +3,86 @@ S3-compatible storage service for file uploads and retrieval.
 Handles receipt file uploads with validation and signed URL generation.
 Works with Backblaze B2, AWS S3, or any S3-compatible storage.
 """
+import hashlib
+import hmac
+import io
 import os
-from datetime import datetime, UTC
-from typing import BinaryIO
+import tempfile
+import threading
+import time
+from functools import cache, lru_cache
+from typing import BinaryIO, List, Optional
+from urllib.parse import quote, urlsplit
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
+from cachetools import TTLCache
 
 from app.config import settings
 from app.core.exceptions import BadRequestError
 
+# Receipts above the threshold are uploaded as parallel multipart chunks,
+# read from the spooled upload in 1 MB blocks rather than the 256 KB default
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    io_chunksize=1024 * 1024,
+    max_concurrency=4
+)
+
+# One client serves every request: keep enough pooled keep-alive connections
+# for concurrent uploads (each multipart upload can use TRANSFER_CONFIG's
+# max_concurrency of them) so TLS handshakes aren't repeated under load
+S3_CLIENT_CONFIG = Config(
+    signature_version='s3v4',
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60,
+    retries={'mode': 'standard', 'max_attempts': 3}
+)
+
+# Allowed receipt extensions, normalized once (lowercase, leading dot)
+ALLOWED_EXTENSIONS = frozenset(ext.lower() for ext in settings.ALLOWED_EXTENSIONS)
+ALLOWED_EXTENSIONS_TEXT = ', '.join(sorted(ALLOWED_EXTENSIONS))
+
+# Receipt filename sanitization: separators and control characters become '_', NUL is dropped
+RECEIPT_FILENAME_TABLE = str.maketrans({
+    **{chr(code): '_' for code in range(32)},
+    ' ': '_',
+    '/': '_',
+    '\\': '_',
+    '\x7f': '_',
+    '\0': None,
+})
+
+# Default lifetime of pre-signed receipt URLs, in seconds
+PRESIGNED_URL_EXPIRATION = 3600
+
+
+@lru_cache(maxsize=4)
+def derive_signing_key(secret_key: str, region: str, date_stamp: str) -> bytes:
+    """
+    Derive the SigV4 signing key for S3, memoized per day.
+
+    The cache holds a few entries so requests straddling UTC midnight don't
+    evict each other's key.
+
+    Args:
+        secret_key: S3 secret access key
+        region: S3 region name
+        date_stamp: UTC date in YYYYMMDD format
+
+    Returns:
+        HMAC-SHA256 signing key scoped to date/region/s3
+    """
+    key = ("AWS4" + secret_key).encode("utf-8")
+    for part in (date_stamp, region, "s3", "aws4_request"):
+        key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+    return key
+
 
 class StorageService:
     """
@@ -24,17 +93,24 @@ class StorageService:
     """
 
     def __init__(self):
-        """Initialize S3 client and ensure bucket exists."""
+        """Initialize S3 client and ensure bucket exists (unless S3_ENSURE_BUCKET is off)."""
         self.s3_client = boto3.client(
             's3',
             endpoint_url=settings.S3_ENDPOINT_URL,
             aws_access_key_id=settings.S3_ACCESS_KEY,
             aws_secret_access_key=settings.S3_SECRET_KEY,
             region_name=settings.S3_REGION,
-            config=Config(signature_version='s3v4')
+            config=S3_CLIENT_CONFIG
         )
         self.bucket_name = settings.S3_BUCKET_NAME
-        self._ensure_bucket_exists()
+        # Signed URLs are reused for at most half their lifetime
+        self._url_cache = TTLCache(maxsize=10_000, ttl=PRESIGNED_URL_EXPIRATION // 2)
+        self._url_cache_lock = threading.Lock()
+        # Request-independent SigV4 inputs, computed once
+        self._endpoint = urlsplit(settings.S3_ENDPOINT_URL)
+        self._bucket_path = f"{self._endpoint.path.rstrip('/')}/{quote(self.bucket_name, safe='')}/"
+        if settings.S3_ENSURE_BUCKET:
+            self._ensure_bucket_exists()
 
     def _ensure_bucket_exists(self):
         """
@@ -54,14 +130,19 @@ class StorageService:
                     if create_error.response.get('Error', {}).get('Code') != 'BucketAlreadyOwnedByYou':
                         raise
 
-    def upload_file(self, file: BinaryIO, key: str, content_type: str) -> str:
+    def upload_file(self, file: BinaryIO, key: str, content_type: str, size: Optional[int] = None) -> str:
         """
         Upload file to S3-compatible storage (Backblaze B2).
 
+        Files of known size below the multipart threshold are sent with a single
+        put_object request; larger or unsized files go through the multipart
+        transfer manager.
+
         Args:
             file: File-like object to upload
             key: S3 object key (path within bucket)
             content_type: MIME type of the file
+            size: File size in bytes, if known
 
         Returns:
             The S3 key of the uploaded file
@@ -70,22 +151,43 @@ class StorageService:
             BadRequestError: If upload fails
         """
         try:
-            self.s3_client.upload_fileobj(
-                file,
-                self.bucket_name,
-                key,
-                ExtraArgs={'ContentType': content_type}
-            )
+            if size is not None and size < TRANSFER_CONFIG.multipart_threshold:
+                # One PUT, no transfer-manager threads or chunk buffers
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Body=file,
+                    ContentType=content_type,
+                    ContentLength=size
+                )
+            else:
+                self.s3_client.upload_fileobj(
+                    file,
+                    self.bucket_name,
+                    key,
+                    ExtraArgs={'ContentType': content_type},
+                    Config=TRANSFER_CONFIG
+                )
             return key
         except ClientError as e:
             raise BadRequestError(detail=f"File upload failed: {str(e)}")
 
-    def generate_presigned_url(self, key: str, expiration: int = 3600) -> str:
+    def presign_window(self, expiration: int = PRESIGNED_URL_EXPIRATION) -> int:
+        """
+        Return the current signed-URL cache window (half the expiration long).
+
+        URLs handed out within the same window are still valid for at least half
+        their lifetime, so responses containing them may be cached per window.
+        """
+        return int(time.time()) // max(expiration // 2, 1)
+
+    def generate_presigned_url(self, key: str, expiration: int = PRESIGNED_URL_EXPIRATION) -> str:
         """
         Generate a pre-signed URL for viewing a file.
 
         The URL allows temporary access to the file without exposing S3 credentials.
-        Default expiration is 1 hour.
+        Default expiration is 1 hour. URLs are cached per time window of half the
+        expiration, so a cached URL always has at least half its validity left.
 
         Args:
             key: S3 object key
@@ -94,18 +196,61 @@ class StorageService:
         Returns:
             Pre-signed URL string
 
-        Raises:
-            BadRequestError: If URL generation fails
         """
-        try:
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': self.bucket_name, 'Key': key},
-                ExpiresIn=expiration
-            )
+        cache_key = (self.bucket_name, key, expiration, self.presign_window(expiration))
+        with self._url_cache_lock:
+            url = self._url_cache.get(cache_key)
+        if url is not None:
             return url
-        except ClientError as e:
-            raise BadRequestError(detail=f"Failed to generate signed URL: {str(e)}")
+
+        url = self.generate_presigned_urls_bulk([key], expiration)[0]
+
+        with self._url_cache_lock:
+            self._url_cache[cache_key] = url
+        return url
+
+    def generate_presigned_urls_bulk(self, keys: List[str], expiration: int = PRESIGNED_URL_EXPIRATION) -> List[str]:
+        """
+        Generate pre-signed GET URLs for many files at once.
+
+        Signs with AWS Signature Version 4 directly: the signing key is cached per
+        day and the credential scope and query string are computed once per call,
+        so each URL costs only one SHA-256 and one HMAC. URLs are path-style
+        ({endpoint}/{bucket}/{key}).
+
+        Args:
+            keys: S3 object keys
+            expiration: URL expiration time in seconds (default: 3600 = 1 hour)
+
+        Returns:
+            Pre-signed URL strings, in the same order as keys
+        """
+        endpoint = self._endpoint
+
+        amz_date = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        date_stamp = amz_date[:8]
+        scope = f"{date_stamp}/{settings.S3_REGION}/s3/aws4_request"
+        signing_key = derive_signing_key(settings.S3_SECRET_KEY, settings.S3_REGION, date_stamp)
+
+        # Canonical query string (parameters sorted by name)
+        query = (
+            "X-Amz-Algorithm=AWS4-HMAC-SHA256"
+            f"&X-Amz-Credential={quote(f'{settings.S3_ACCESS_KEY}/{scope}', safe='')}"
+            f"&X-Amz-Date={amz_date}"
+            f"&X-Amz-Expires={expiration}"
+            "&X-Amz-SignedHeaders=host"
+        )
+        string_to_sign_prefix = f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n"
+
+        urls = []
+        for key in keys:
+            path = self._bucket_path + quote(key, safe='/~')
+            canonical_request = f"GET\n{path}\n{query}\nhost:{endpoint.netloc}\n\nhost\nUNSIGNED-PAYLOAD"
+            string_to_sign = string_to_sign_prefix + hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+            signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+            urls.append(f"{endpoint.scheme}://{endpoint.netloc}{path}?{query}&X-Amz-Signature={signature}")
+
+        return urls
 
     def delete_file(self, key: str):
         """
@@ -116,7 +261,7 @@ class StorageService:
 
         Note:
             This is a destructive operation. Use with caution.
-            Currently not used (we don't delete submissions), but provided for completeness.
+            Used to remove a receipt whose submission record failed to save.
         """
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
@@ -137,24 +282,31 @@ def validate_file_extension(filename: str) -> str:
     Raises:
         BadRequestError: If file extension is not allowed
     """
-    ext = os.path.splitext(filename)[1].lower()
+    name, dot, suffix = filename.rpartition('.')
+    ext = f".{suffix.lower()}" if dot and name else ""
 
-    if ext not in settings.ALLOWED_EXTENSIONS:
-        allowed = ', '.join(settings.ALLOWED_EXTENSIONS)
+    if ext not in ALLOWED_EXTENSIONS:
         raise BadRequestError(
-            detail=f"File type {ext} not allowed. Allowed types: {allowed}"
+            detail=f"File type {ext} not allowed. Allowed types: {ALLOWED_EXTENSIONS_TEXT}"
         )
 
     return ext
 
 
-def validate_file_size(file: BinaryIO, max_size: int) -> int:
+def validate_file_size(file: BinaryIO, max_size: int, size: Optional[int] = None) -> int:
     """
     Validate file size doesn't exceed maximum.
 
+    A size already known to the caller (e.g. UploadFile.size, recorded while
+    the form was parsed) is used as is. Otherwise files backed by a descriptor
+    are measured with a single fstat and keep their stream position; spooled
+    and in-memory streams are measured by seeking and are rewound to the
+    beginning.
+
     Args:
         file: File-like object to validate
         max_size: Maximum size in bytes (defaults to settings.MAX_UPLOAD_SIZE)
+        size: File size in bytes, if already known
 
     Returns:
         File size in bytes
@@ -165,10 +317,20 @@ def validate_file_size(file: BinaryIO, max_size: int) -> int:
     if max_size is None:
         max_size = settings.MAX_UPLOAD_SIZE
 
-    # Get file size by seeking to end
-    file.seek(0, 2)  # Seek to end
-    size = file.tell()
-    file.seek(0)  # Reset to beginning
+    # fileno() would force an in-memory spooled upload onto disk, so spooled
+    # files are always measured by seeking
+    if size is None and not isinstance(file, tempfile.SpooledTemporaryFile):
+        try:
+            file.flush()  # Buffered writes are not visible to fstat yet
+            size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            size = None
+
+    if size is None:
+        # Get file size by seeking to end
+        file.seek(0, 2)  # Seek to end
+        size = file.tell()
+        file.seek(0)  # Reset to beginning
 
     if size > max_size:
         max_mb = max_size / (1024 * 1024)
@@ -193,12 +355,20 @@ def generate_receipt_key(category_id: int, submission_id: int, filename: str) ->
     Returns:
         S3 object key string
     """
-    timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-    # Sanitize filename (replace spaces with underscores)
-    safe_filename = filename.replace(" ", "_")
+    # time.gmtime avoids building a timezone-aware datetime just to format it
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+    # Sanitize filename in one pass (spaces, path separators, control characters)
+    safe_filename = filename.translate(RECEIPT_FILENAME_TABLE)
     key = f"receipts/{category_id}/{submission_id}/{timestamp}_{safe_filename}"
     return key
 
 
-# Global storage service instance
-storage_service = StorageService()
+@cache
+def get_storage_service() -> StorageService:
+    """
+    Return the shared storage service, creating it on first use.
+
+    Deferring construction keeps imports (tests, Alembic, CLI tools) free of
+    S3 client setup and the startup bucket check.
+    """
+    return StorageService()
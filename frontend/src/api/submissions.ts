@@ -13,12 +13,25 @@ export const fetchSubmissionsApi = async (
   categoryId: string,
   statusFilter?: SubmissionStatus
 ): Promise<PaymentSubmission[]> => {
-  const params = statusFilter ? { status_filter: statusFilter } : {};
-  const { data } = await apiClient.get<PaymentSubmission[]>(
-    `/api/categories/${categoryId}/submissions`,
-    { params }
-  );
-  return data;
+  const submissions: PaymentSubmission[] = [];
+  let cursor: string | undefined;
+
+  // The list is paginated; follow X-Next-Cursor until the last page
+  do {
+    const params = {
+      limit: 500,
+      ...(statusFilter ? { status_filter: statusFilter } : {}),
+      ...(cursor ? { cursor } : {}),
+    };
+    const { data, headers } = await apiClient.get<PaymentSubmission[]>(
+      `/api/categories/${categoryId}/submissions`,
+      { params }
+    );
+    submissions.push(...data);
+    cursor = headers['x-next-cursor'];
+  } while (cursor);
+
+  return submissions;
 };
 
 export const fetchSubmissionApi = async (id: string): Promise<PaymentSubmission> => {